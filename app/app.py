@@ -1,15 +1,35 @@
-from fastapi import FastAPI
+import os
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from openai import NotFoundError, OpenAIError
 from pydantic import BaseModel
 from typing import List
 from app.model_classification import (
-    classify_profiles,
+    classify_bios,
+    submit_classification_batch,
+    get_classification_batch,
+    close_client,
     get_classification_prompt,
     update_classification_prompt,
     reset_to_default_prompt,
     get_editable_criteria,
 )
 
-app = FastAPI(title="Bio-Classifier")
+# Unknown LOG_LEVEL values fall back to INFO rather than failing at import
+_log_level = (os.getenv("LOG_LEVEL") or "info").strip().upper()
+logging.basicConfig(level=logging.getLevelNamesMapping().get(_log_level, logging.INFO))
+log = logging.getLogger(__name__)
+if _log_level not in logging.getLevelNamesMapping():
+    log.warning("⚠️ Unknown LOG_LEVEL %r, using INFO", _log_level)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close pooled OpenAI connections cleanly instead of dropping them at exit
+    await close_client()
+
+app = FastAPI(title="Bio-Classifier", lifespan=lifespan)
 
 class ClassifyRequest(BaseModel):
     bios: List[str]
@@ -18,6 +38,13 @@ class ClassifyRequest(BaseModel):
 class ClassifyResponse(BaseModel):
     results: List[str]
 
+class BatchSubmitResponse(BaseModel):
+    batch_id: str
+
+class BatchStatusResponse(BaseModel):
+    status: str
+    results: List[str] | None = None
+
 class PromptUpdateRequest(BaseModel):
     criteria: str
 
@@ -26,24 +53,39 @@ class PromptResponse(BaseModel):
 
 @app.post("/classify", response_model=ClassifyResponse)
 async def classify(req: ClassifyRequest):
-    payload = [{"username": str(i), "bio": b} for i, b in enumerate(req.bios)]
-    # If per-request criteria is provided, temporarily override for this call only
-    if req.criteria and isinstance(req.criteria, str) and req.criteria.strip():
-        print(f"🧪 [DEBUG] Using per-request criteria for /classify (chars={len(req.criteria)})")
-        from app import model_classification as mc
-        original_criteria = mc._current_criteria
-        original_prompt = mc._current_prompt
-        try:
-            mc._current_criteria = req.criteria
-            mc._current_prompt = mc._build_full_prompt(req.criteria)
-            flags = classify_profiles(payload)
-        finally:
-            mc._current_criteria = original_criteria
-            mc._current_prompt = original_prompt
+    # Per-request criteria is passed down for this call only; server state is untouched
+    if req.criteria and req.criteria.strip():
+        log.debug("🧪 Using per-request criteria for /classify (chars=%d)", len(req.criteria))
     else:
-        print("ℹ️ [DEBUG] /classify using default server criteria")
-        flags = classify_profiles(payload)
-    return {"results": flags}
+        log.debug("ℹ️ /classify using default server criteria")
+    verdicts = await classify_bios(req.bios, criteria=req.criteria)
+    return {"results": [str(i) for i, v in enumerate(verdicts) if v == "yes"]}
+
+@app.post("/classify/batch", response_model=BatchSubmitResponse)
+async def classify_batch(req: ClassifyRequest):
+    """Queue bios on the OpenAI Batch API; poll GET /classify/batch/{batch_id} for results."""
+    try:
+        batch_id = await submit_classification_batch(req.bios, criteria=req.criteria)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OpenAIError as e:
+        log.error("❗️Batch submission failed (%s: %s)", type(e).__name__, e)
+        raise HTTPException(status_code=502, detail="OpenAI batch submission failed")
+    return {"batch_id": batch_id}
+
+@app.get("/classify/batch/{batch_id}", response_model=BatchStatusResponse)
+async def classify_batch_status(batch_id: str):
+    """Batch status; `results` is filled in once the batch has completed."""
+    try:
+        status = await get_classification_batch(batch_id)
+    except NotFoundError:
+        status = None
+    except OpenAIError as e:
+        log.error("❗️Batch lookup failed for %s (%s: %s)", batch_id, type(e).__name__, e)
+        raise HTTPException(status_code=502, detail="OpenAI batch lookup failed")
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown batch: {batch_id}")
+    return status
 
 @app.get("/prompt", response_model=PromptResponse)
 async def get_prompt():
@@ -58,11 +100,11 @@ async def get_criteria():
 @app.put("/prompt", response_model=PromptResponse)
 async def update_prompt(req: PromptUpdateRequest):
     """Update only the editable criteria; boilerplate is fixed server-side."""
-    updated_prompt = update_classification_prompt(req.criteria)
+    updated_prompt = await update_classification_prompt(req.criteria)
     return {"prompt": updated_prompt}
 
 @app.post("/prompt/reset", response_model=PromptResponse)
 async def reset_prompt():
     """Reset the classification prompt to default"""
-    reset_prompt = reset_to_default_prompt()
+    reset_prompt = await reset_to_default_prompt()
     return {"prompt": reset_prompt}
\ No newline at end of file
@@ -1,22 +1,66 @@
 import os
 import re
+import asyncio
+import hashlib
 import json
+import logging
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from contextlib import closing
 from pathlib import Path
 from typing import Optional
-from openai import OpenAI
+import orjson
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DEFAULT_CONNECTION_LIMITS, Timeout
 from dotenv import load_dotenv
 
+__all__ = [
+    "classify_bios",
+    "classify_profiles",
+    "submit_classification_batch",
+    "get_classification_batch",
+    "close_client",
+    "get_classification_prompt",
+    "get_editable_criteria",
+    "update_classification_prompt",
+    "reset_to_default_prompt",
+    "DEFAULT_CRITERIA_TEXT",
+]
+
 load_dotenv()
+log = logging.getLogger(__name__)
 # ---------- classification constants & helpers ----------
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# One shared client: keep-alive connections skip the TLS handshake on later calls.
+# Limits/Timeout come from the SDK's own transport types, not a separate httpx import
+client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    timeout=Timeout(60.0, connect=5.0),
+    http_client=DefaultAsyncHttpxClient(
+        limits=type(DEFAULT_CONNECTION_LIMITS)(
+            max_connections=256, max_keepalive_connections=64, keepalive_expiry=60.0
+        ),
+    ),
+)
 
 # Environment-configurable defaults
 CLASSIFY_MODEL_DEFAULT = os.getenv("CLASSIFY_MODEL", "gpt-5-mini")
 CLASSIFY_REASONING_EFFORT_DEFAULT = os.getenv("CLASSIFY_REASONING_EFFORT")  # minimal|low|medium|high
 CLASSIFY_VERBOSITY_DEFAULT = os.getenv("CLASSIFY_VERBOSITY")  # low|medium|high
+CLASSIFY_MAX_CONCURRENCY = max(1, int(os.getenv("CLASSIFY_MAX_CONCURRENCY", "8")))
+# Bios per LLM call. Smaller shards mean more parallelism and a cheaper
+# length-mismatch fallback, but every shard resends the full (uncached) prompt
+CLASSIFY_SHARD_SIZE = max(1, int(os.getenv("CLASSIFY_SHARD_SIZE", "32")))
+CLASSIFY_BATCH_CHUNK_SIZE = 64  # bios per request line in Batch API jobs
+CLASSIFY_CACHE_SIZE = int(os.getenv("CLASSIFY_CACHE_SIZE", "100000"))  # 0 disables
+
+# Bounds in-flight LLM calls across all concurrent /classify requests
+_SEM = asyncio.Semaphore(CLASSIFY_MAX_CONCURRENCY)
 
-_ALLOWED_EFFORT = {"minimal", "low", "medium", "high"}
-_ALLOWED_VERBOSITY = {"low", "medium", "high"}
+_ALLOWED_EFFORT = frozenset({"minimal", "low", "medium", "high"})
+_ALLOWED_VERBOSITY = frozenset({"low", "medium", "high"})
+
+# Punctuation/emoji stripped from bios (see _llm_text / _normalize_bio)
+_PUNCT_RE = re.compile(r"[^\w\s]")
 
 # Boilerplate prompt: header/footer are immutable; only criteria text is user-editable
 DEFAULT_PROMPT_HEADER = (
@@ -24,9 +68,25 @@ DEFAULT_PROMPT_HEADER = (
 )
 DEFAULT_PROMPT_FOOTER = (
     "\nIf the bio does **not** clearly show no affiliation with what we desire, reply **no**.\n\n"
-    "Return a single space-separated list of yes/no in the same order as the bios."
+    "Return a JSON object whose \"flags\" array has one yes/no per bio, in the same order as the bios."
 )
 
+# Structured output: the model must answer {"flags": ["yes" | "no", ...]}.
+# The schema can't pin the array length, so _parse_flags still checks it.
+_FLAGS_FORMAT = {
+    "type": "json_schema",
+    "name": "flags",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "flags": {"type": "array", "items": {"type": "string", "enum": ["yes", "no"]}},
+        },
+        "required": ["flags"],
+        "additionalProperties": False,
+    },
+}
+
 # Default editable criteria text
 DEFAULT_CRITERIA_TEXT = (
     "**Say yes** if the bio contains an explicit Christian signal – e.g. the words Jesus, Christ, Christian, Bible, a Scripture reference (John 3:16, 1 Cor 13:4-8, etc.), ✝️ cross emoji, 'saved by grace', 'follower of Christ', or similar.\n"
@@ -36,6 +96,44 @@ DEFAULT_CRITERIA_TEXT = (
 # File path for storing the prompt
 PROMPT_FILE_PATH = Path(__file__).parent.parent / "data" / "classification_prompt.json"
 
+# SQLite store backing the in-memory verdict cache, so verdicts survive restarts
+VERDICT_DB_PATH = PROMPT_FILE_PATH.parent / "verdict_cache.sqlite"
+
+# Per-batch position maps written at submit time, so deduplicated Batch API
+# verdicts can be fanned back out to the original bio positions
+BATCH_MAP_DIR = PROMPT_FILE_PATH.parent / "batches"
+_BATCH_ID_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+def _llm_text(bio: str) -> str:
+    """Text sent to the LLM for a bio: punctuation/emoji stripped, original casing kept."""
+    return _PUNCT_RE.sub(" ", bio).strip()
+
+def _normalize_bio(bio: str) -> str:
+    """
+    Canonical form used only as the dedup/cache key: punctuation and emoji
+    stripped, casefolded, whitespace collapsed. Near-duplicates such as
+    "Jesus is king ✝️" and "jesus is king!!" map to the same key.
+    """
+    return " ".join(_PUNCT_RE.sub(" ", bio).casefold().split())
+
+def _group_unique_bios(bios) -> dict:
+    """
+    {normalized bio: [positions]} for every non-blank bio. The LLM sees the
+    first bio of each group (via _llm_text), not the normalized key.
+    """
+    uniq = {}
+    for i, bio in enumerate(bios):
+        if not bio or bio.isspace():
+            continue
+        clean = _normalize_bio(bio)
+        if clean:
+            uniq.setdefault(clean, []).append(i)
+    return uniq
+
+async def close_client():
+    """Close the shared OpenAI client's connection pool (called on app shutdown)."""
+    await client.close()
+
 def _ensure_data_directory():
     """Ensure the data directory exists"""
     PROMPT_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -43,172 +141,450 @@ def _ensure_data_directory():
 def _build_full_prompt(criteria_text: str) -> str:
     return f"{DEFAULT_PROMPT_HEADER}{criteria_text}\n{DEFAULT_PROMPT_FOOTER}"
 
-def _load_prompt_from_file() -> str:
-    """Load the FULL prompt (header + criteria + footer)."""
+def _load_prompt_from_file() -> tuple[str, str]:
+    """Load the FULL prompt (header + criteria + footer) and the editable criteria in one read."""
     try:
         if PROMPT_FILE_PATH.exists():
             with open(PROMPT_FILE_PATH, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 if 'criteria' in data:
-                    return _build_full_prompt(data['criteria'])
+                    return _build_full_prompt(data['criteria']), data['criteria']
                 if 'prompt' in data:
                     # Legacy support
-                    return data['prompt']
-                return _build_full_prompt(DEFAULT_CRITERIA_TEXT)
+                    return data['prompt'], DEFAULT_CRITERIA_TEXT
+                return _build_full_prompt(DEFAULT_CRITERIA_TEXT), DEFAULT_CRITERIA_TEXT
         else:
-            print(f"ℹ️ No saved prompt found at {PROMPT_FILE_PATH}, using default")
-            return _build_full_prompt(DEFAULT_CRITERIA_TEXT)
+            log.info("ℹ️ No saved prompt found at %s, using default", PROMPT_FILE_PATH)
+            return _build_full_prompt(DEFAULT_CRITERIA_TEXT), DEFAULT_CRITERIA_TEXT
     except Exception as e:
-        print(f"⚠️ Error loading prompt from file: {e}, using default")
-        return _build_full_prompt(DEFAULT_CRITERIA_TEXT)
+        log.warning("⚠️ Error loading prompt from file: %s, using default", e)
+        return _build_full_prompt(DEFAULT_CRITERIA_TEXT), DEFAULT_CRITERIA_TEXT
 
 def _save_criteria_to_file(criteria_text: str) -> bool:
-    """Persist only the editable criteria to disk."""
+    """Persist only the editable criteria to disk (write-then-rename, so readers never see a partial file)."""
+    tmp_path = None
     try:
         _ensure_data_directory()
         data = {
             'criteria': criteria_text,
             'last_updated': str(Path(__file__).stat().st_mtime)  # Simple timestamp
         }
-        with open(PROMPT_FILE_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"✅ Prompt saved to {PROMPT_FILE_PATH}")
+        fd, tmp_path = tempfile.mkstemp(dir=PROMPT_FILE_PATH.parent, suffix=".json.tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        # mkstemp creates 0600 files; keep the prompt file's usual 0644
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, PROMPT_FILE_PATH)
+        log.info("✅ Prompt saved to %s", PROMPT_FILE_PATH)
         return True
     except Exception as e:
-        print(f"❌ Error saving prompt to file: {e}")
+        log.error("❌ Error saving prompt to file: %s", e)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
         return False
 
-_current_prompt = _load_prompt_from_file()
-_current_criteria = DEFAULT_CRITERIA_TEXT
-try:
-    if PROMPT_FILE_PATH.exists():
-        with open(PROMPT_FILE_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            _current_criteria = data.get('criteria', DEFAULT_CRITERIA_TEXT)
-except Exception:
-    _current_criteria = DEFAULT_CRITERIA_TEXT
+# Loaded from disk on first use rather than at import, so worker processes that
+# never touch the prompt skip the file read
+_current_prompt: Optional[str] = None
+_current_criteria: Optional[str] = None
+
+# Serializes prompt updates (in-memory swap + disk write)
+_PROMPT_LOCK = asyncio.Lock()
+
+def _ensure_prompt_loaded():
+    global _current_prompt, _current_criteria
+    if _current_prompt is None:
+        _current_prompt, _current_criteria = _load_prompt_from_file()
 
 def get_classification_prompt() -> str:
     """Get the current classification prompt"""
+    _ensure_prompt_loaded()
     return _current_prompt
 
 def get_editable_criteria() -> str:
     """Return only the editable criteria portion for UI editing."""
+    _ensure_prompt_loaded()
     return _current_criteria
 
-def update_classification_prompt(new_criteria: str) -> str:
+async def update_classification_prompt(new_criteria: str) -> str:
     """Update only the editable criteria; rebuild and persist the full prompt."""
     global _current_prompt, _current_criteria
-    _current_criteria = new_criteria
-    _current_prompt = _build_full_prompt(_current_criteria)
-    if _save_criteria_to_file(_current_criteria):
-        print("✅ Classification criteria updated and persisted")
-    else:
-        print("⚠️ Criteria updated but failed to persist")
-    return _current_prompt
+    # Held across the threaded write so concurrent updates can't leave the file
+    # and the in-memory criteria disagreeing
+    async with _PROMPT_LOCK:
+        _current_criteria = new_criteria
+        _current_prompt = _build_full_prompt(_current_criteria)
+        # File I/O runs in a worker thread so the event loop isn't blocked on disk
+        if await asyncio.to_thread(_save_criteria_to_file, _current_criteria):
+            log.info("✅ Classification criteria updated and persisted")
+        else:
+            log.warning("⚠️ Criteria updated but failed to persist")
+        return _current_prompt
+
+def _effective_prompt(criteria: Optional[str] = None) -> str:
+    """Prompt for a single call: per-request criteria if non-blank, else the server's prompt."""
+    if criteria and criteria.strip():
+        return _build_full_prompt(criteria)
+    return get_classification_prompt()
 
-def reset_to_default_prompt() -> str:
+async def reset_to_default_prompt() -> str:
     """Reset criteria to default (boilerplate remains fixed)."""
-    return update_classification_prompt(DEFAULT_CRITERIA_TEXT)
+    return await update_classification_prompt(DEFAULT_CRITERIA_TEXT)
+
+# LRU of LLM verdicts keyed by (clean bio, prompt key); survives across /classify calls.
+# Misses fall through to the SQLite store at VERDICT_DB_PATH before reaching the LLM
+_VERDICT_CACHE: "OrderedDict[tuple[str, str], str]" = OrderedDict()
+
+def _prompt_key(model: str, prompt: str) -> str:
+    """Short digest identifying the model + prompt a verdict was produced under."""
+    return hashlib.blake2b(f"{model}\n{prompt}".encode("utf-8"), digest_size=8).hexdigest()
+
+def _cache_get(key):
+    flag = _VERDICT_CACHE.get(key)
+    if flag is not None:
+        _VERDICT_CACHE.move_to_end(key)
+    return flag
+
+def _cache_put(key, flag: str):
+    if CLASSIFY_CACHE_SIZE <= 0:
+        return
+    _VERDICT_CACHE[key] = flag
+    _VERDICT_CACHE.move_to_end(key)
+    if len(_VERDICT_CACHE) > CLASSIFY_CACHE_SIZE:
+        _VERDICT_CACHE.popitem(last=False)
+
+def _db_key(clean: str, prompt_key: str) -> str:
+    return hashlib.sha1(f"{prompt_key}|{clean}".encode("utf-8")).hexdigest()
+
+def _db_connect() -> sqlite3.Connection:
+    VERDICT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(VERDICT_DB_PATH)
+    conn.execute("CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, flag TEXT NOT NULL)")
+    return conn
+
+def _db_get_many(keys) -> dict:
+    """Stored verdicts for `keys`; a missing or unreadable store is treated as all misses."""
+    found = {}
+    try:
+        with closing(_db_connect()) as conn:
+            for start in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(conn.execute(
+                    f"SELECT key, flag FROM verdicts WHERE key IN ({placeholders})", chunk
+                ))
+    except Exception as e:
+        log.warning("⚠️ Error reading verdict cache: %s", e)
+    return found
+
+def _db_put_many(items) -> None:
+    """Persist (key, flag) pairs; failures only cost future cache hits."""
+    try:
+        with closing(_db_connect()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO verdicts (key, flag) VALUES (?, ?)", items)
+    except Exception as e:
+        log.warning("⚠️ Error writing verdict cache: %s", e)
+
+def _extract_output_text(resp) -> str:
+    """Plain text output from a Responses API result (SDK object or raw JSON body)."""
+    if isinstance(resp, dict):
+        output_text, output_items = resp.get("output_text"), resp.get("output")
+    else:
+        output_text, output_items = getattr(resp, "output_text", None), getattr(resp, "output", [])
+    output_text = (output_text or "").strip()
+    if not output_text:
+        # Fallback: attempt to reconstruct from output items if needed
+        try:
+            chunks = []
+            for item in output_items or []:
+                content = item.get("content") if isinstance(item, dict) else None
+                if isinstance(content, list):
+                    for c in content:
+                        if isinstance(c, dict) and c.get("type") == "output_text":
+                            chunks.append(c.get("text", ""))
+            output_text = "".join(chunks).strip()
+        except Exception:
+            output_text = ""
+    return output_text
+
+def _parse_flags(output_text: str, expected: int):
+    """Yes/no flags from the structured LLM output; None if unparseable or the count doesn't match."""
+    try:
+        flags = json.loads(output_text)["flags"]
+        if not isinstance(flags, list):
+            raise TypeError("'flags' is not a list")
+    except (ValueError, TypeError, KeyError) as e:
+        log.warning("⚠️ Unparseable LLM output (%s: %s)", type(e).__name__, e)
+        return None
+
+    # Validate length
+    if len(flags) != expected:
+        log.warning("⚠️ Length mismatch: got %d, expected %d", len(flags), expected)
+        return None  # Caller defaults to no for mismatched results
+    # Enforce backend rule: only explicit 'yes' counts as yes; everything else => 'no'
+    return [
+        "yes" if isinstance(f, str) and f.strip().lower().startswith("y") else "no"
+        for f in flags
+    ]
 
-def classify_profiles(
+def _request_kwargs(bios, prompt: str, base_kwargs: dict) -> dict:
+    """Responses API arguments for one shard of bios."""
+    payload = "\n".join(f"{i+1}) {b}" for i, b in enumerate(bios))
+    return {
+        **base_kwargs,
+        # Combine instructions and payload for the Responses API input
+        "input": f"{prompt}\n\n{payload}",
+    }
+
+def _resolve_base_kwargs(
+    model: Optional[str] = None,
+    reasoning_effort: Optional[str] = None,
+    verbosity: Optional[str] = None,
+) -> dict:
+    """Resolve model/effort/verbosity from parameters or environment."""
+    selected_model = (model or CLASSIFY_MODEL_DEFAULT).strip()
+    effort = (reasoning_effort or CLASSIFY_REASONING_EFFORT_DEFAULT)
+    effort = effort.lower().strip() if isinstance(effort, str) else None
+    if effort not in _ALLOWED_EFFORT:
+        effort = None
+
+    verb = (verbosity or CLASSIFY_VERBOSITY_DEFAULT)
+    verb = verb.lower().strip() if isinstance(verb, str) else None
+    if verb not in _ALLOWED_VERBOSITY:
+        verb = None
+
+    base_kwargs = {"model": selected_model, "text": {"format": _FLAGS_FORMAT}}
+    if effort:
+        base_kwargs["reasoning"] = {"effort": effort}
+    if verb:
+        base_kwargs["text"]["verbosity"] = verb
+    return base_kwargs
+
+# Environment config is fixed for the process lifetime, so resolve it once;
+# only calls that pass explicit overrides rebuild the kwargs
+_DEFAULT_KWARGS = _resolve_base_kwargs()
+
+async def _classify_shard(bios, prompt: str, base_kwargs: dict):
+    """Send one shard of bios to the LLM; returns a yes/no flag per bio, or None on failure."""
+    try:
+        async with _SEM:
+            async with client.responses.stream(**_request_kwargs(bios, prompt, base_kwargs)) as stream:
+                # Count array separators as JSON arrives; once there are clearly
+                # more flags than bios the output is unusable, so stop paying for it
+                separators = 0
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        separators += event.delta.count(",")
+                        if separators > len(bios) + 2:
+                            log.warning("⚠️ Aborting stream: output exceeds %d flags", len(bios))
+                            return None
+                resp = await stream.get_final_response()
+        log.debug("✅ OpenAI OK — model %s", resp.model)
+        return _parse_flags(_extract_output_text(resp), len(bios))
+    except Exception as e:
+        log.error("❗️GPT batch failed (%s: %s); using no for all uncertain bios.", type(e).__name__, e)
+        return None
+
+async def classify_bios(
+    bios,
+    model: Optional[str] = None,
+    reasoning_effort: Optional[str] = None,
+    verbosity: Optional[str] = None,
+    criteria: Optional[str] = None,
+):
+    """
+    Returns a 'yes' / 'no' verdict for each bio, in order.
+    Sends every unique non-empty bio to GPT for classification, in concurrent shards.
+    `criteria` overrides the server-side criteria for this call only.
+    """
+    # Identical bios are classified once; empty bios default to "no" without an LLM call
+    uniq = _group_unique_bios(bios)
+
+    # Verdict per bio position; anything not classified stays "no"
+    verdicts = ["no"] * len(bios)
+
+    if uniq:
+        prompt = _effective_prompt(criteria)
+
+        if model is None and reasoning_effort is None and verbosity is None:
+            base_kwargs = _DEFAULT_KWARGS
+        else:
+            base_kwargs = _resolve_base_kwargs(model, reasoning_effort, verbosity)
+
+        # Bios already classified under this model + prompt skip the LLM entirely
+        prompt_key = _prompt_key(base_kwargs["model"], prompt)
+        for clean in list(uniq):
+            flag = _cache_get((clean, prompt_key))
+            if flag is not None:
+                for i in uniq.pop(clean):
+                    verdicts[i] = flag
+
+    # Then the on-disk store (SQLite I/O runs in a worker thread)
+    if uniq and CLASSIFY_CACHE_SIZE > 0:
+        db_keys = {clean: _db_key(clean, prompt_key) for clean in uniq}
+        stored = await asyncio.to_thread(_db_get_many, list(db_keys.values()))
+        for clean, key in db_keys.items():
+            flag = stored.get(key)
+            if flag is not None:
+                _cache_put((clean, prompt_key), flag)
+                for i in uniq.pop(clean):
+                    verdicts[i] = flag
+
+    # LLM classification for unique non-empty bios not found in the cache
+    if uniq:
+        all_bios = list(uniq)
+        log.debug("🤔 Sending %d unique bios to LLM for analysis (%d total)", len(all_bios), len(bios))
+
+        # Each group is represented by its first bio, with its original casing
+        texts = {key: _llm_text(bios[uniq[key][0]]) for key in all_bios}
+
+        # Shards run concurrently (bounded by _SEM); results come back in order
+        shards = [
+            all_bios[start:start + CLASSIFY_SHARD_SIZE]
+            for start in range(0, len(all_bios), CLASSIFY_SHARD_SIZE)
+        ]
+        shard_flags = await asyncio.gather(
+            *[_classify_shard([texts[key] for key in shard], prompt, base_kwargs) for shard in shards]
+        )
+
+        # Fan each verdict back out to every profile sharing that bio;
+        # failed shards are left out so they default to "no" and are not cached
+        new_rows = []
+        for shard, flags in zip(shards, shard_flags):
+            if flags is None:
+                continue
+            for clean, flag in zip(shard, flags):
+                _cache_put((clean, prompt_key), flag)
+                new_rows.append((_db_key(clean, prompt_key), flag))
+                for i in uniq[clean]:
+                    verdicts[i] = flag
+
+        if new_rows and CLASSIFY_CACHE_SIZE > 0:
+            await asyncio.to_thread(_db_put_many, new_rows)
+
+    return verdicts
+
+async def classify_profiles(
     profile_data,
     model: Optional[str] = None,
     reasoning_effort: Optional[str] = None,
     verbosity: Optional[str] = None,
+    criteria: Optional[str] = None,
 ):
     """
     Adds 'is_christian' = 'yes' / 'no' to each dict in `profile_data`.
-    Sends every bio to GPT for classification.
+    Thin wrapper over `classify_bios`; returns the usernames classified 'yes'.
     """
-    all_bios = []
-    all_indices = []
+    verdicts = await classify_bios(
+        [item["bio"] for item in profile_data],
+        model=model,
+        reasoning_effort=reasoning_effort,
+        verbosity=verbosity,
+        criteria=criteria,
+    )
+    # Attach verdicts and collect 'yes' usernames in a single pass
+    out = []
+    for item, flag in zip(profile_data, verdicts):
+        item["is_christian"] = flag
+        if flag == "yes":
+            out.append(item["username"])
+    return out
 
-    for i, item in enumerate(profile_data):
-        bio = (item["bio"] or "").strip()
-        clean = re.sub(r"[^\w\s]", " ", bio).strip()
+def _batch_map_path(batch_id: str) -> Optional[Path]:
+    # batch_id arrives from the URL, so only accept plain ids as file names
+    if not _BATCH_ID_RE.fullmatch(batch_id):
+        return None
+    return BATCH_MAP_DIR / f"{batch_id}.json"
 
-        all_bios.append(clean)
-        all_indices.append(i)
+def _save_batch_map(batch_id: str, total: int, positions) -> None:
+    BATCH_MAP_DIR.mkdir(parents=True, exist_ok=True)
+    _batch_map_path(batch_id).write_bytes(orjson.dumps({"total": total, "positions": positions}))
 
-    results = {}
+def _load_batch_map(batch_id: str) -> Optional[dict]:
+    path = _batch_map_path(batch_id)
+    if path is None or not path.exists():
+        return None
+    return orjson.loads(path.read_bytes())
 
-    # LLM classification for all bios
-    if all_bios:
-        print(f"🤔 Sending {len(all_bios)} bios to LLM for analysis")
+async def submit_classification_batch(
+    bios,
+    criteria: Optional[str] = None,
+) -> str:
+    """
+    Queue bios on the OpenAI Batch API (half price, completes within 24h).
+    Returns the batch id to poll with `get_classification_batch`.
+    Raises ValueError if every bio is blank.
+    """
+    # Same dedup/blank handling as classify_bios: only unique non-blank bios are billed
+    uniq = _group_unique_bios(bios)
+    if not uniq:
+        raise ValueError("No non-blank bios to classify")
+    unique_bios = list(uniq)
 
-        prompt = get_classification_prompt()
-        payload = "\n".join(f"{i+1}) {b}" for i, b in enumerate(all_bios))
-        try:
-            # Resolve configuration from parameters or environment
-            selected_model = (model or CLASSIFY_MODEL_DEFAULT).strip()
-            effort = (reasoning_effort or CLASSIFY_REASONING_EFFORT_DEFAULT)
-            effort = effort.lower().strip() if isinstance(effort, str) else None
-            if effort not in _ALLOWED_EFFORT:
-                effort = None
-
-            verb = (verbosity or CLASSIFY_VERBOSITY_DEFAULT)
-            verb = verb.lower().strip() if isinstance(verb, str) else None
-            if verb not in _ALLOWED_VERBOSITY:
-                verb = None
-
-            request_kwargs = {
-                "model": selected_model,
-                # Combine instructions and payload for the Responses API input
-                "input": f"{prompt}\n\n{payload}",
-            }
-            if effort:
-                request_kwargs["reasoning"] = {"effort": effort}
-            if verb:
-                request_kwargs["text"] = {"verbosity": verb}
-
-            resp = client.responses.create(**request_kwargs)
-            print(f"✅ OpenAI OK — model {resp.model}")
-
-            # Extract plain text output from Responses API
-            output_text = (getattr(resp, "output_text", None) or "").strip()
-            if not output_text:
-                # Fallback: attempt to reconstruct from output items if needed
-                try:
-                    output_items = getattr(resp, "output", [])
-                    chunks = []
-                    for item in output_items or []:
-                        content = item.get("content") if isinstance(item, dict) else None
-                        if isinstance(content, list):
-                            for c in content:
-                                if isinstance(c, dict) and c.get("type") == "output_text":
-                                    chunks.append(c.get("text", ""))
-                    output_text = "".join(chunks).strip()
-                except Exception:
-                    output_text = ""
-
-            flags = (output_text or "").strip().split()
-            
-            # Validate length
-            if len(flags) != len(all_bios):
-                print(f"⚠️ Length mismatch: got {len(flags)}, expected {len(all_bios)}")
-                flags = ["no"] * len(all_bios)  # Default to no for mismatched results
-            # Enforce backend rule: only explicit 'yes' counts as yes; everything else => 'no'
-            flags = [
-                "yes" if isinstance(f, str) and f.strip().lower().startswith("y") else "no"
-                for f in flags
-            ]
-                
-        except Exception as e:
-            print(f"❗️GPT batch failed ({type(e).__name__}: {e}); using no for all uncertain bios.")
-            flags = ["no"] * len(all_bios)
-
-        # Update results for bios
-        for i, flag in enumerate(flags):
-            original_index = all_indices[i]
-            username = profile_data[original_index]["username"]
-            results[username] = flag.lower()
-
-    # Default any remaining to "no"
-    for item in profile_data:
-        username = item["username"]
-        item["is_christian"] = results.get(username, "no")
-
-    return [i["username"] for i in profile_data
-                    if i["is_christian"] == "yes"]
+    prompt = _effective_prompt(criteria)
+    base_kwargs = _DEFAULT_KWARGS
+
+    # One JSONL line per chunk; custom_id records the chunk's slice of the unique bios
+    lines = []
+    for start in range(0, len(unique_bios), CLASSIFY_BATCH_CHUNK_SIZE):
+        chunk = [
+            _llm_text(bios[uniq[key][0]])
+            for key in unique_bios[start:start + CLASSIFY_BATCH_CHUNK_SIZE]
+        ]
+        lines.append(json.dumps({
+            "custom_id": f"{start}-{start + len(chunk)}",
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": _request_kwargs(chunk, prompt, base_kwargs),
+        }, ensure_ascii=False))
+
+    batch_file = await client.files.create(
+        file=("classify_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h",
+    )
+    # Positions of each unique bio, used to fan verdicts back out on retrieval
+    await asyncio.to_thread(_save_batch_map, batch.id, len(bios), list(uniq.values()))
+    log.info(
+        "📦 Submitted batch %s (%d bios, %d unique, %d requests)",
+        batch.id, len(bios), len(unique_bios), len(lines),
+    )
+    return batch.id
+
+async def get_classification_batch(batch_id: str) -> Optional[dict]:
+    """
+    Status of a submitted batch, or None if it wasn't submitted from this server.
+    Once completed, `results` holds the indices of 'yes' bios, in the same
+    format as `classify_profiles`.
+    """
+    batch_map = await asyncio.to_thread(_load_batch_map, batch_id)
+    if batch_map is None:
+        return None
+
+    batch = await client.batches.retrieve(batch_id)
+    if batch.status != "completed" or not batch.output_file_id:
+        return {"status": batch.status, "results": None}
+
+    positions = batch_map["positions"]
+    flags = ["no"] * len(positions)
+    content = await client.files.content(batch.output_file_id)
+    for line in content.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        start, end = (int(x) for x in record["custom_id"].split("-"))
+        body = (record.get("response") or {}).get("body") or {}
+        parsed = _parse_flags(_extract_output_text(body), end - start)
+        if parsed is not None:
+            flags[start:end] = parsed
 
+    # Fan each unique bio's verdict back out to every position that shared it
+    verdicts = ["no"] * batch_map["total"]
+    for flag, indices in zip(flags, positions):
+        for i in indices:
+            verdicts[i] = flag
+    return {"status": batch.status, "results": [str(i) for i, f in enumerate(verdicts) if f == "yes"]}